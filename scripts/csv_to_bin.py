@@ -0,0 +1,54 @@
+"""
+CSV to Binary Converter
+One-shot conversion of vibration CSVs to raw float32 .bin traces
+
+The .bin files hold flat (time, accel) float32 pairs that load_csv reads
+back with np.fromfile — no text parsing, which dominates load time for
+large sensor recordings.
+"""
+import glob
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.io_utils import load_csv
+
+
+def convert(filepath: str) -> str:
+    """Convert one CSV to a .bin file next to it; returns the new path"""
+    time, accel, fs = load_csv(filepath, dtype=np.float32)
+
+    if time is None:
+        raise ValueError("CSV has no time column; .bin format needs one")
+
+    out_path = str(Path(filepath).with_suffix(".bin"))
+    np.column_stack([time, accel]).astype(np.float32).tofile(out_path)
+
+    return out_path
+
+
+def main():
+    pattern = sys.argv[1] if len(sys.argv) > 1 else "sample_data/*.csv"
+
+    files = sorted(glob.glob(pattern))
+    if not files:
+        print(f"No files found matching: {pattern}")
+        print("Run 'python scripts/generate_sample_data.py' first")
+        return
+
+    print(f"Converting {len(files)} file(s) to binary...")
+    for filepath in files:
+        try:
+            print(f"   {filepath} -> {convert(filepath)}")
+        except Exception as e:
+            print(f"❌ Error converting {filepath}: {e}")
+
+    print("Done. Pass the .bin paths to the analysis scripts as usual.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,10 @@
 Comprehensive Test Suite for Motor Vibration Fault Detector
 Tests all core functionality and validates fault detection logic
 """
+import os
 import sys
+import tempfile
+import warnings
 from pathlib import Path
 import numpy as np
 
@@ -289,6 +292,77 @@ def test_edge_cases(results: TestResults):
         f"Got {kurt_const}"
     )
 
+    # Header-only CSV (valid header, zero data rows)
+    fd, header_only = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w") as fh:
+        fh.write("time,accel\n")
+    try:
+        time, accel, fs = load_csv(header_only)
+        results.add_test(
+            "Header-only CSV yields empty arrays",
+            len(time) == 0 and len(accel) == 0 and fs is None,
+            f"time: {len(time)}, accel: {len(accel)}, fs: {fs}"
+        )
+    except Exception as e:
+        results.add_test(
+            "Header-only CSV yields empty arrays",
+            False,
+            str(e)
+        )
+    try:
+        # Drop the sidecar so this exercises the prefix parse, not the cache
+        sidecar = header_only[:-4] + ".npz"
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+        _, accel, fs = load_csv(header_only, need_time=False)
+        results.add_test(
+            "Header-only CSV loads with need_time=False",
+            len(accel) == 0 and fs is None,
+            f"accel: {len(accel)}, fs: {fs}"
+        )
+    except Exception as e:
+        results.add_test(
+            "Header-only CSV loads with need_time=False",
+            False,
+            str(e)
+        )
+    finally:
+        os.remove(header_only)
+        sidecar = header_only[:-4] + ".npz"
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+
+    # Short trace (fewer rows than the fs-inference prefix) with
+    # need_time=False must load cleanly and without loadtxt warnings
+    fd, short_csv = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w") as fh:
+        fh.write("time,accel\n")
+        for i in range(100):
+            fh.write(f"{i / 1000.0},{0.1 * i}\n")
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            _, accel, fs = load_csv(short_csv, need_time=False)
+        results.add_test(
+            "Short CSV loads cleanly with need_time=False",
+            len(accel) == 100 and fs is not None,
+            f"accel: {len(accel)}, fs: {fs}"
+        )
+    except Warning as w:
+        results.add_test(
+            "Short CSV loads cleanly with need_time=False",
+            False,
+            f"warning raised: {w}"
+        )
+    except Exception as e:
+        results.add_test(
+            "Short CSV loads cleanly with need_time=False",
+            False,
+            str(e)
+        )
+    finally:
+        os.remove(short_csv)
+
 
 def run_all_tests():
     """Run complete test suite"""
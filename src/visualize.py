@@ -2,11 +2,25 @@
 Visualization Module for Vibration Analysis
 Generate plots for time-domain and frequency-domain analysis
 """
+import gc
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import List, NamedTuple
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # raster backend: fastest for PNG output, no display needed
 import matplotlib.pyplot as plt
 
+# Cheaper path rendering for dense line traces
+plt.rcParams['agg.path.chunksize'] = 10000
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+# Plots are resolution-bound by figure DPI anyway, so traces longer
+# than ~2x this are stride-decimated before drawing
+_MAX_PLOT_POINTS = 5000
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -14,40 +28,135 @@ from src.features import compute_fft
 from src.diagnostics import diagnose_vibration
 
 
-def plot_vibration_analysis(time: np.ndarray, 
-                           accel: np.ndarray,
-                           fs: float,
-                           title: str = "Vibration Analysis",
-                           running_freq: float = 30.0,
-                           save_path: str = None):
+class Analyzed(NamedTuple):
     """
-    Create comprehensive vibration analysis plot
-    
-    Creates a 2-subplot figure:
-    - Top: Time-domain signal
-    - Bottom: Frequency spectrum with fault indicators
-    
-    Args:
-        time: time array (seconds)
-        accel: acceleration signal
-        fs: sampling frequency (Hz)
-        title: plot title
-        running_freq: machine running frequency (Hz)
-        save_path: optional path to save figure
+    One fully analyzed sample: signal, spectrum, and diagnostic report
+
+    Produced by a single analysis pass so every plot function drawing
+    the same file reuses the FFT and report instead of recomputing them.
     """
-    # Run diagnostics
-    report = diagnose_vibration(accel, fs, running_freq)
-    
-    # Compute FFT
+    filepath: str
+    time: np.ndarray
+    accel: np.ndarray
+    fs: float
+    freqs: np.ndarray
+    mags: np.ndarray
+    report: dict
+
+
+def analyze(filepath: str, running_freq: float = 30.0):
+    """
+    Load, transform and diagnose one file exactly once
+
+    Returns an Analyzed sample, or None if the sampling frequency
+    cannot be inferred.
+    """
+    from src.io_utils import load_csv
+
+    time, accel, fs = load_csv(filepath)
+
+    if fs is None:
+        return None
+
     freqs, mags = compute_fft(accel, fs)
-    
-    # Create figure with 2 subplots
-    fig, axes = plt.subplots(2, 1, figsize=(12, 8))
+    report = diagnose_vibration(accel, fs, running_freq,
+                                spectrum=(freqs, mags))
+
+    return Analyzed(filepath, time, accel, fs, freqs, mags, report)
+
+
+def analyze_all(data_pattern: str = "sample_data/*.csv",
+                running_freq: float = 30.0) -> List[Analyzed]:
+    """
+    Analyze every file matching the pattern in one pass
+
+    Equal-length signals share a single batched FFT; the returned
+    samples carry everything the plot functions need, so generating
+    both the per-file plots and the comparison grid costs one analysis
+    pass total.
+    """
+    import glob
+    from src.io_utils import load_csv
+
+    loaded = []
+    for filepath in sorted(glob.glob(data_pattern)):
+        try:
+            time, accel, fs = load_csv(filepath)
+        except Exception as e:
+            print(f"Error loading {filepath}: {e}")
+            continue
+
+        if fs is None:
+            print(f"⚠️  Skipping {filepath} - no sampling frequency")
+            continue
+
+        loaded.append((filepath, time, accel, fs))
+
+    spectra = [None] * len(loaded)
+    lengths = {len(accel) for _, _, accel, _ in loaded}
+    fs_values = {fs for *_, fs in loaded}
+
+    if len(loaded) > 1 and len(lengths) == 1 and len(fs_values) == 1:
+        A = np.stack([accel for _, _, accel, _ in loaded])
+        freqs, mags_all = compute_fft(A, fs_values.pop())
+        spectra = [(freqs, mags_all[k]) for k in range(len(loaded))]
+
+    samples = []
+    for (filepath, time, accel, fs), spectrum in zip(loaded, spectra):
+        freqs, mags = spectrum if spectrum is not None else compute_fft(accel, fs)
+        report = diagnose_vibration(accel, fs, running_freq,
+                                    spectrum=(freqs, mags))
+        samples.append(Analyzed(filepath, time, accel, fs, freqs, mags, report))
+
+    return samples
+
+
+def _decimate_for_plot(time: np.ndarray, accel: np.ndarray):
+    """
+    Stride-decimate a dense trace down to ~_MAX_PLOT_POINTS for drawing
+
+    Feature extraction always sees the full signal; only the plotted
+    line is thinned, since anything beyond a few thousand points per
+    axis is invisible at the saved DPI.
+    """
+    if len(accel) > 2 * _MAX_PLOT_POINTS:
+        step = len(accel) // _MAX_PLOT_POINTS
+        return time[::step], accel[::step]
+    return time, accel
+
+
+def _draw_into(fig, axes,
+               time: np.ndarray,
+               accel: np.ndarray,
+               fs: float,
+               title: str = "Vibration Analysis",
+               running_freq: float = 30.0,
+               save_path: str = None,
+               spectrum=None,
+               report: dict = None):
+    """
+    Draw the 2-panel vibration analysis into existing axes
+
+    Core of plot_vibration_analysis, split out so batch callers can
+    reuse one figure across files (clear + redraw) instead of paying
+    figure/canvas construction and teardown per plot. Callers holding
+    an Analyzed sample pass its spectrum/report through so nothing is
+    recomputed.
+    """
+    # Compute FFT once and share it with the diagnostics pass
+    freqs, mags = spectrum if spectrum is not None else compute_fft(accel, fs)
+
+    # Run diagnostics (reuses the spectrum above instead of re-running rfft)
+    if report is None:
+        report = diagnose_vibration(accel, fs, running_freq,
+                                    spectrum=(freqs, mags))
+
     fig.suptitle(title, fontsize=14, fontweight='bold')
     
     # ========== TIME DOMAIN PLOT ==========
     ax1 = axes[0]
-    ax1.plot(time, accel, 'b-', linewidth=0.8, alpha=0.8)
+    t_plot, a_plot = _decimate_for_plot(time, accel)
+    ax1.plot(t_plot, a_plot, 'b-', linewidth=0.8, alpha=0.8, rasterized=True)
     ax1.set_xlabel('Time (s)')
     ax1.set_ylabel('Acceleration (g)')
     ax1.set_title('Time Domain Signal')
@@ -99,154 +208,254 @@ Crest Factor: {report['features']['crest_factor']:.2f}"""
              fontsize=9,
              family='monospace')
     
-    plt.tight_layout()
-    
+    fig.tight_layout()
+
     # Save if requested
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
         print(f"📊 Plot saved: {save_path}")
-    
+
+    return report
+
+
+def plot_vibration_analysis(time: np.ndarray,
+                           accel: np.ndarray,
+                           fs: float,
+                           title: str = "Vibration Analysis",
+                           running_freq: float = 30.0,
+                           save_path: str = None):
+    """
+    Create comprehensive vibration analysis plot
+
+    Creates a 2-subplot figure:
+    - Top: Time-domain signal
+    - Bottom: Frequency spectrum with fault indicators
+
+    Args:
+        time: time array (seconds)
+        accel: acceleration signal
+        fs: sampling frequency (Hz)
+        title: plot title
+        running_freq: machine running frequency (Hz)
+        save_path: optional path to save figure
+    """
+    fig, axes = plt.subplots(2, 1, figsize=(12, 8))
+    report = _draw_into(fig, axes, time, accel, fs, title,
+                        running_freq, save_path)
     return fig, report
 
 
+# One figure per worker process, reused across files: figure/canvas
+# construction is pure overhead when every plot has the same layout
+_worker_fig = None
+
+# Every this-many rendered plots, drop all figures and cycle the GC so
+# matplotlib's text/tick caches can't accumulate over long glob runs
+_PLOTS_PER_PURGE = 10
+_plots_since_purge = 0
+
+def _reusable_fig():
+    global _worker_fig
+    if _worker_fig is None:
+        _worker_fig = plt.subplots(2, 1, figsize=(12, 8))
+    return _worker_fig
+
+def _count_plot_and_purge():
+    """Track rendered plots; periodically release all matplotlib state"""
+    global _worker_fig, _plots_since_purge
+    _plots_since_purge += 1
+    if _plots_since_purge >= _PLOTS_PER_PURGE:
+        plt.close('all')
+        _worker_fig = None  # recreated lazily by _reusable_fig
+        gc.collect()
+        _plots_since_purge = 0
+
+
+def _plot_one(filepath: str, output_dir: str = "outputs",
+              running_freq: float = 30.0):
+    """
+    Render the analysis plot for one data file
+
+    Top-level so it is picklable for the process pool; returns a
+    warning/error message for the parent to print, or None on success.
+    """
+    import matplotlib
+    matplotlib.use("Agg", force=True)  # headless raster backend in workers
+
+    from src.io_utils import load_csv
+
+    try:
+        time, accel, fs = load_csv(filepath)
+
+        if fs is None:
+            return f"⚠️  Skipping {filepath} - no sampling frequency"
+
+        filename = Path(filepath).stem
+        title = f"Vibration Analysis: {filename.upper()}"
+        save_path = Path(output_dir) / f"{filename}_analysis.png"
+
+        # Clear and redraw into the worker's persistent figure instead
+        # of allocating (and tearing down) a fresh one per file
+        fig, axes = _reusable_fig()
+        axes[0].clear()
+        axes[1].clear()
+        _draw_into(fig, axes, time, accel, fs, title,
+                   running_freq, str(save_path))
+        _count_plot_and_purge()
+    except Exception as e:
+        return f"❌ Error plotting {filepath}: {e}"
+
+    return None
+
+
 def plot_all_samples(data_pattern: str = "sample_data/*.csv",
                     output_dir: str = "outputs",
-                    running_freq: float = 30.0):
+                    running_freq: float = 30.0,
+                    samples: List[Analyzed] = None):
     """
     Generate plots for all sample data files
-    
+
+    Files are rendered in parallel worker processes: each plot is an
+    independent CSV parse + FFT + Agg render, so the work fans out
+    across cores with no shared state. When the caller already holds
+    analyzed samples (see analyze_all), they are rendered directly from
+    the precomputed spectra/reports instead.
+
     Args:
         data_pattern: glob pattern for data files
         output_dir: directory to save plots
         running_freq: machine running frequency (Hz)
+        samples: optional pre-analyzed samples to render as-is
     """
     import glob
-    from src.io_utils import load_csv
-    
+
+    if samples is not None:
+        Path(output_dir).mkdir(exist_ok=True)
+        print(f"Generating plots for {len(samples)} sample(s)...")
+
+        for s in samples:
+            filename = Path(s.filepath).stem
+            fig, axes = _reusable_fig()
+            axes[0].clear()
+            axes[1].clear()
+            _draw_into(fig, axes, s.time, s.accel, s.fs,
+                       f"Vibration Analysis: {filename.upper()}",
+                       running_freq,
+                       str(Path(output_dir) / f"{filename}_analysis.png"),
+                       spectrum=(s.freqs, s.mags), report=s.report)
+            _count_plot_and_purge()
+
+        print(f"\n✅ All plots saved to: {output_dir}/")
+        return
+
     files = sorted(glob.glob(data_pattern))
     if not files:
         print(f"No files found matching: {data_pattern}")
         return
-    
+
     # Create output directory
     Path(output_dir).mkdir(exist_ok=True)
-    
+
     print(f"Generating plots for {len(files)} file(s)...")
-    
-    for filepath in files:
-        try:
-            # Load data
-            time, accel, fs = load_csv(filepath)
-            
-            if fs is None:
-                print(f"⚠️  Skipping {filepath} - no sampling frequency")
-                continue
-            
-            # Generate plot
-            filename = Path(filepath).stem
-            title = f"Vibration Analysis: {filename.upper()}"
-            save_path = Path(output_dir) / f"{filename}_analysis.png"
-            
-            plot_vibration_analysis(time, accel, fs, title, 
-                                  running_freq, str(save_path))
-            
-            plt.close()  # Close to avoid memory issues
-            
-        except Exception as e:
-            print(f"❌ Error plotting {filepath}: {e}")
-    
+
+    if len(files) > 1:
+        with ProcessPoolExecutor() as ex:
+            messages = list(ex.map(partial(_plot_one, output_dir=output_dir,
+                                           running_freq=running_freq), files))
+    else:
+        messages = [_plot_one(files[0], output_dir, running_freq)]
+
+    for message in messages:
+        if message is not None:
+            print(message)
+
     print(f"\n✅ All plots saved to: {output_dir}/")
 
 
 def plot_comparison_grid(data_pattern: str = "sample_data/*.csv",
                         running_freq: float = 30.0,
-                        save_path: str = "outputs/comparison_grid.png"):
+                        save_path: str = "outputs/comparison_grid.png",
+                        samples: List[Analyzed] = None):
     """
     Create a comparison grid showing all samples
-    
+
     Args:
         data_pattern: glob pattern for data files
         running_freq: machine running frequency (Hz)
         save_path: path to save comparison figure
+        samples: optional pre-analyzed samples (see analyze_all); when
+                 omitted, one shared analysis pass is run here
     """
-    import glob
-    from src.io_utils import load_csv
-    
-    files = sorted(glob.glob(data_pattern))
-    if not files:
+    if samples is None:
+        samples = analyze_all(data_pattern, running_freq)
+
+    if not samples:
         print(f"No files found matching: {data_pattern}")
         return
-    
-    n_files = len(files)
+
+    n_files = len(samples)
     fig, axes = plt.subplots(n_files, 2, figsize=(14, 3*n_files))
-    
+
     if n_files == 1:
         axes = axes.reshape(1, -1)
-    
+
     fig.suptitle('Vibration Analysis Comparison', fontsize=16, fontweight='bold')
-    
-    for idx, filepath in enumerate(files):
+
+    for idx, s in enumerate(samples):
         try:
-            # Load data
-            time, accel, fs = load_csv(filepath)
-            
-            if fs is None:
-                continue
-            
-            # Compute FFT
-            freqs, mags = compute_fft(accel, fs)
-            
-            # Run diagnostics
-            report = diagnose_vibration(accel, fs, running_freq)
-            
-            filename = Path(filepath).stem.upper()
-            
+            filename = Path(s.filepath).stem.upper()
+
             # Time domain
             ax_time = axes[idx, 0]
-            ax_time.plot(time, accel, 'b-', linewidth=0.6, alpha=0.8)
+            t_plot, a_plot = _decimate_for_plot(s.time, s.accel)
+            ax_time.plot(t_plot, a_plot, 'b-', linewidth=0.6, alpha=0.8,
+                         rasterized=True)
             ax_time.set_ylabel('Accel (g)')
             ax_time.set_title(f'{filename} - Time Domain')
             ax_time.grid(True, alpha=0.3)
-            
+
             if idx == n_files - 1:
                 ax_time.set_xlabel('Time (s)')
-            
+
             # Frequency domain
             ax_freq = axes[idx, 1]
-            ax_freq.plot(freqs, mags, 'b-', linewidth=0.8)
+            ax_freq.plot(s.freqs, s.mags, 'b-', linewidth=0.8)
             ax_freq.set_ylabel('Magnitude')
-            ax_freq.set_title(f'{filename} - FFT (Health: {report["health_score"]}/100)')
+            ax_freq.set_title(f'{filename} - FFT (Health: {s.report["health_score"]}/100)')
             ax_freq.set_xlim([0, 200])
             ax_freq.grid(True, alpha=0.3)
-            
+
             # Mark fault frequencies
             ax_freq.axvline(running_freq, color='green', linestyle='--', alpha=0.5)
             ax_freq.axvline(2*running_freq, color='orange', linestyle='--', alpha=0.5)
-            
+
             if idx == n_files - 1:
                 ax_freq.set_xlabel('Frequency (Hz)')
-            
+
         except Exception as e:
-            print(f"Error plotting {filepath}: {e}")
-    
-    plt.tight_layout()
-    
+            print(f"Error plotting {s.filepath}: {e}")
+
+    fig.tight_layout()
+
     # Save
     Path(save_path).parent.mkdir(exist_ok=True)
-    plt.savefig(save_path, dpi=150, bbox_inches='tight')
+    fig.savefig(save_path, dpi=150, bbox_inches='tight')
     print(f"\n📊 Comparison grid saved: {save_path}")
-    
+
     return fig
 
 
 if __name__ == "__main__":
     """Generate all visualizations when run directly"""
     print("🎨 Generating vibration analysis visualizations...\n")
-    
+
+    # One analysis pass feeds every figure below
+    samples = analyze_all()
+
     # Individual plots
-    plot_all_samples()
-    
+    plot_all_samples(samples=samples)
+
     # Comparison grid
-    plot_comparison_grid()
-    
+    plot_comparison_grid(samples=samples)
+
     print("\n✅ All visualizations complete!")